@@ -3,9 +3,13 @@
 import json
 import logging
 import os
-from dataclasses import dataclass
-from pathlib import Path
-from typing import Optional
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Optional, Tuple
+
+_LOG_LEVELS = frozenset(("DEBUG", "INFO", "WARNING", "ERROR"))
+
+# Parsed config files keyed by (path, mtime_ns, size); unchanged files skip re-parsing
+_parsed_config_cache: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
 
 
 @dataclass
@@ -15,6 +19,8 @@ class Config:
     # Archive handling
     max_extraction_ratio: float = 100.0
     max_nested_depth: int = 3
+    # CRC-check every member during validation (decompresses the whole archive)
+    deep_integrity_check: bool = False
 
     # Logging
     log_level: str = "INFO"
@@ -32,25 +38,44 @@ class Config:
         if self.max_nested_depth < 1:
             raise ValueError("max_nested_depth must be >= 1")
 
-        if self.log_level not in ("DEBUG", "INFO", "WARNING", "ERROR"):
+        if self.log_level not in _LOG_LEVELS:
             raise ValueError(f"Invalid log level: {self.log_level}")
 
         if self.log_dir:
-            self.log_dir = str(Path(self.log_dir).expanduser().absolute())
+            self.log_dir = os.path.abspath(os.path.expanduser(self.log_dir))
 
     @classmethod
     def from_file(cls, path: str) -> "Config":
         """Load configuration from JSON file."""
-        with open(path, "r") as f:
-            data = json.load(f)
-        # Only use keys that exist in our dataclass
-        valid_keys = cls.__annotations__.keys()
-        filtered = {k: v for k, v in data.items() if k in valid_keys}
-        return cls(**filtered)
+        return cls(**cls._read_file(path))
+
+    @classmethod
+    def _read_file(cls, path: str) -> Dict[str, Any]:
+        """Read the known keys from a JSON config file, cached by mtime and size."""
+        st = os.stat(path)
+        key = (str(path), st.st_mtime_ns, st.st_size)
+        filtered = _parsed_config_cache.get(key)
+        if filtered is None:
+            with open(path, "rb") as f:
+                data = json.loads(f.read())
+            # Only use keys that exist in our dataclass
+            valid_keys = cls.__annotations__.keys()
+            filtered = {k: v for k, v in data.items() if k in valid_keys}
+            _parsed_config_cache[key] = filtered
+        return filtered
+
+
+# Field names accepted as overrides by load_config
+_FIELDS = frozenset(f.name for f in fields(Config))
+
 
 def load_config(config_file: Optional[str] = None, **overrides) -> Config:
     """Load configuration with optional file and CLI overrides.
 
+    File values and overrides are merged first so the Config is built (and
+    validated) once. A config file with invalid values is ignored with a
+    warning; invalid overrides raise ValueError.
+
     Args:
         config_file: Optional path to JSON config file
         **overrides: CLI overrides (None values are ignored)
@@ -58,20 +83,28 @@ def load_config(config_file: Optional[str] = None, **overrides) -> Config:
     Returns:
         Config object
     """
-    # Start with defaults
-    config = Config()
+    file_settings: Dict[str, Any] = {}
 
     # Load from file if provided
     if config_file and os.path.exists(config_file):
         try:
-            config = Config.from_file(config_file)
+            file_settings = Config._read_file(config_file)
             logging.info(f"Loaded config from {config_file}")
         except Exception as e:
             logging.warning(f"Failed to load config: {e}")
 
-    # Apply CLI overrides (skip None values)
-    for key, value in overrides.items():
-        if value is not None and hasattr(config, key):
-            setattr(config, key, value)
-
-    return config
+    # CLI overrides take precedence (skip None values)
+    cli_settings = {
+        key: value for key, value in overrides.items() if value is not None and key in _FIELDS
+    }
+
+    try:
+        return Config(**{**file_settings, **cli_settings})
+    except (TypeError, ValueError) as e:
+        if not file_settings:
+            raise
+        # Build from the overrides alone first, so a bad override raises its
+        # own error instead of the file being blamed for it
+        config = Config(**cli_settings)
+        logging.warning(f"Ignoring invalid config file {config_file}: {e}")
+        return config
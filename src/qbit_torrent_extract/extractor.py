@@ -2,24 +2,39 @@
 
 import logging
 import os
+import shutil
 import sys
 import tarfile
+import tempfile
 import zipfile
+import zlib
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Set
+from typing import Dict, List, Any, Optional, Set, Tuple
 
-import py7zr
 import rarfile
 from tqdm import tqdm
 
 from .config import Config
-from .validator import ArchiveValidator
+from .validator import ArchiveValidator, GZIP_READ_BUFFER, archive_type_from_name
 
 logger = logging.getLogger("qbit_torrent_extract")
 
 # Extensions for incomplete downloads - skip these
 INCOMPLETE_EXTENSIONS = {'.!qb', '.part', '.crdownload', '.tmp'}
 
+# Chunk size for copying TAR members out (tarfile's default is 16 KiB)
+_TAR_COPY_BUFFER = 128 * 1024
+
+
+def _move_into_place(staged: Path, target: Path) -> None:
+    """Move a staged tree into target, merging into directories that exist."""
+    for entry in staged.iterdir():
+        destination = target / entry.name
+        if entry.is_dir() and destination.is_dir():
+            _move_into_place(entry, destination)
+        else:
+            os.replace(entry, destination)
+
 
 class ArchiveExtractor:
     """Extracts archives with nested archive support."""
@@ -61,8 +76,10 @@ class ArchiveExtractor:
         }
         self.extracted_archives.clear()
 
-        # Process archives with nested extraction support
-        max_iterations = self.config.max_nested_depth + 1
+        # Each pass extracts the archives the previous pass produced, so the
+        # pass number is the nesting level. One pass beyond the limit reports
+        # the archives that are nested too deep instead of leaving them unseen
+        max_iterations = self.config.max_nested_depth + 2
         for iteration in range(max_iterations):
             archives = self._find_all_archives(directory_path)
             new_archives = [a for a in archives if a not in self.extracted_archives]
@@ -73,8 +90,16 @@ class ArchiveExtractor:
 
             logger.info(f"Iteration {iteration + 1}: Found {len(new_archives)} archives")
 
+            # Classify split parts once; a .rar costs a stat of its .r00 sibling
+            split_parts = {a: self.validator.is_split_archive_part(a) for a in new_archives}
+
+            # Validate up front in parallel; extraction below hits the cache
+            self.validator.validate_archives([a for a in new_archives if split_parts[a][1]])
+
             for archive_path in tqdm(new_archives, desc=f"Extracting", disable=not self.config.progress_indicators):
-                result = self._extract_single_archive(archive_path)
+                result = self._extract_single_archive(
+                    archive_path, depth=iteration, split_part=split_parts[archive_path]
+                )
                 stats["total_processed"] += 1
 
                 if result["success"]:
@@ -96,29 +121,33 @@ class ArchiveExtractor:
 
     def _find_all_archives(self, directory: Path) -> List[Path]:
         """Find all supported archive files in the directory."""
+        # One walk of the tree, classifying names as we go
         archives = []
-        for ext in self.validator.SUPPORTED_EXTENSIONS:
-            # Handle compound extensions
-            if ext == ".tar.gz":
-                archives.extend(directory.rglob("*.tar.gz"))
-            elif ext == ".tgz":
-                archives.extend(directory.rglob("*.tgz"))
-            else:
-                archives.extend(directory.rglob(f"*{ext}"))
-
-        # Filter out incomplete downloads
-        filtered = []
-        for archive in archives:
-            if any(archive.name.endswith(inc) for inc in INCOMPLETE_EXTENSIONS):
-                logger.debug(f"Skipping incomplete download: {archive}")
-                continue
-            filtered.append(archive)
-
-        return sorted(set(filtered))
-
-    def _extract_single_archive(self, archive_path: Path) -> Dict[str, Any]:
+        for root, _dirs, files in os.walk(directory):
+            for name in files:
+                if not archive_type_from_name(name):
+                    continue
+                # Filter out incomplete downloads
+                if any(name.endswith(inc) for inc in INCOMPLETE_EXTENSIONS):
+                    logger.debug(f"Skipping incomplete download: {name}")
+                    continue
+                archives.append(Path(root, name))
+
+        return sorted(archives)
+
+    def _extract_single_archive(
+        self,
+        archive_path: Path,
+        depth: int = 0,
+        split_part: Optional[Tuple[bool, bool]] = None,
+    ) -> Dict[str, Any]:
         """Extract a single archive with validation.
 
+        Args:
+            archive_path: Archive to extract
+            depth: Nesting level of the archive (0 for top-level archives)
+            split_part: is_split_archive_part() result, if already known
+
         Returns:
             Dict with keys: success, skipped, error
         """
@@ -130,7 +159,9 @@ class ArchiveExtractor:
             return result
 
         # Check if this is a non-first split archive part
-        is_split, is_first = self.validator.is_split_archive_part(archive_path)
+        if split_part is None:
+            split_part = self.validator.is_split_archive_part(archive_path)
+        is_split, is_first = split_part
         if is_split and not is_first:
             logger.debug(f"Skipping split archive part: {archive_path.name}")
             self.extracted_archives.add(archive_path)
@@ -146,7 +177,7 @@ class ArchiveExtractor:
             return result
 
         # Check nested depth
-        within_limit, depth = self.validator.check_nested_depth(archive_path)
+        within_limit, _ = self.validator.check_nested_depth(archive_path, depth)
         if not within_limit:
             msg = f"Exceeds max nested depth ({self.config.max_nested_depth})"
             logger.warning(f"{archive_path.name}: {msg}")
@@ -186,17 +217,27 @@ class ArchiveExtractor:
         return result
 
     def _extract_zip(self, archive_path: Path) -> bool:
-        """Extract a ZIP archive."""
+        """Extract a ZIP archive.
+
+        CRCs are only verified as members are written, so a corrupt member is
+        found partway through. Members go to a staging directory next to the
+        archive and are moved into place only once all of them extracted, so a
+        failure leaves existing files untouched and no partial output behind.
+        """
+        staging = Path(tempfile.mkdtemp(prefix=".extracting-", dir=archive_path.parent))
         try:
             with zipfile.ZipFile(archive_path, "r") as zf:
-                zf.extractall(path=archive_path.parent)
+                zf.extractall(path=staging)
+            _move_into_place(staging, archive_path.parent)
             return True
-        except zipfile.BadZipFile as e:
+        except (zipfile.BadZipFile, zlib.error, EOFError) as e:
             logger.error(f"Invalid ZIP: {e}")
             return False
         except PermissionError as e:
             logger.error(f"Permission denied: {e}")
             return False
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
 
     def _extract_rar(self, archive_path: Path) -> bool:
         """Extract a RAR archive."""
@@ -216,6 +257,9 @@ class ArchiveExtractor:
 
     def _extract_7z(self, archive_path: Path) -> bool:
         """Extract a 7z archive."""
+        # Imported here: py7zr is slow to import and only needed for .7z
+        import py7zr
+
         try:
             with py7zr.SevenZipFile(archive_path, "r") as szf:
                 if szf.needs_password():
@@ -236,7 +280,14 @@ class ArchiveExtractor:
             mode = "r:gz" if archive_type == "tar.gz" else "r"
             extract_path = archive_path.parent
 
-            with tarfile.open(archive_path, mode) as tf:
+            # gzip is decompressed front to back, so feed it big reads
+            buffering = GZIP_READ_BUFFER if archive_type == "tar.gz" else -1
+            # typeshed's tarfile.open overloads leave out copybufsize, though
+            # open() passes it through to TarFile, which accepts it
+            with open(archive_path, "rb", buffering=buffering) as f, \
+                    tarfile.open(  # type: ignore[call-overload]
+                        fileobj=f, mode=mode, copybufsize=_TAR_COPY_BUFFER
+                    ) as tf:
                 # Python 3.12+ has built-in protection
                 if sys.version_info >= (3, 12):
                     tf.extractall(path=extract_path, filter='data')
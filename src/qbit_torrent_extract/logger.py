@@ -6,6 +6,9 @@ from pathlib import Path
 from typing import Optional
 from logging.handlers import RotatingFileHandler
 
+_LOG_FORMAT = "%(asctime)s | %(levelname)-8s | %(message)s"
+_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
 
 def setup_logging(
     level: str = "INFO",
@@ -25,15 +28,17 @@ def setup_logging(
     logger = logging.getLogger("qbit_torrent_extract")
     logger.setLevel(getattr(logging, level.upper(), logging.INFO))
 
-    # Clear existing handlers
-    logger.handlers.clear()
+    # Close and drop existing handlers so repeat calls don't leak log files
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+        handler.close()
+
+    # One formatter shared by both handlers
+    formatter = logging.Formatter(_LOG_FORMAT, datefmt=_DATE_FORMAT)
 
     # Console handler
     console = logging.StreamHandler(sys.stdout)
-    console.setFormatter(logging.Formatter(
-        "%(asctime)s | %(levelname)-8s | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    ))
+    console.setFormatter(formatter)
     logger.addHandler(console)
 
     # File handler (optional)
@@ -45,10 +50,7 @@ def setup_logging(
             maxBytes=10 * 1024 * 1024,  # 10MB
             backupCount=3,
         )
-        file_handler.setFormatter(logging.Formatter(
-            "%(asctime)s | %(levelname)-8s | %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S"
-        ))
+        file_handler.setFormatter(formatter)
         logger.addHandler(file_handler)
 
     return logger
@@ -63,14 +63,17 @@ def main(
     DIRECTORY: Path to the directory containing archives to extract.
     """
     # Load configuration
-    config_obj = load_config(
-        config_file=config,
-        preserve_originals=preserve,
-        log_level="DEBUG" if verbose else "INFO",
-        max_extraction_ratio=max_ratio,
-        max_nested_depth=max_depth,
-        log_dir=log_dir,
-    )
+    try:
+        config_obj = load_config(
+            config_file=config,
+            preserve_originals=preserve,
+            log_level="DEBUG" if verbose else "INFO",
+            max_extraction_ratio=max_ratio,
+            max_nested_depth=max_depth,
+            log_dir=log_dir,
+        )
+    except ValueError as e:
+        raise click.UsageError(str(e))
 
     # Setup logging
     setup_logging(level=config_obj.log_level, log_dir=config_obj.log_dir)
@@ -90,8 +93,8 @@ def main(
         if verbose:
             archives = extractor.get_archive_files(str(directory))
             logger.info(f"Found {len(archives)} archives")
-            for archive in archives:
-                click.echo(f"  {archive.name}")
+            if archives:
+                click.echo("\n".join(f"  {archive.name}" for archive in archives))
 
         # Extract
         stats = extractor.extract_all(str(directory))
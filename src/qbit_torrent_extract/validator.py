@@ -1,54 +1,253 @@
 """Archive validation and security checks."""
 
+import os
 import re
+import sys
+import threading
 import zipfile
 import rarfile
 import tarfile
-import py7zr
 from pathlib import Path
-from typing import Optional, Tuple, List
+from typing import Dict, Generic, Optional, Tuple, TypeVar, List, Type
 import logging
-from dataclasses import dataclass
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 
 from .config import Config
 
-
-@dataclass
+_EXTENSION_TYPES = {
+    ".zip": "zip",
+    ".rar": "rar",
+    ".7z": "7z",
+    ".tar": "tar",
+    ".tar.gz": "tar.gz",
+    ".tgz": "tar.gz",
+}
+_EXT_TUPLE = tuple(_EXTENSION_TYPES)
+_MAX_EXT_LEN = max(len(ext) for ext in _EXTENSION_TYPES)
+_SPLIT_RN = re.compile(r"^\.r\d+$")
+_SPLIT_PART = re.compile(r"\.part(\d+)\.rar$", re.IGNORECASE)
+
+# Read buffer for .tar.gz files, shared with the extractor
+GZIP_READ_BUFFER = 1024 * 1024
+
+# Archives whose validation results and scans are kept per validator
+_CACHE_SIZE = 1024
+
+# dataclass(slots=True) needs Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def archive_type_from_name(name: str) -> Optional[str]:
+    """Detect archive type from a bare file name or member path."""
+    # Only the tail can hold an extension; ".tar.gz" is the longest
+    tail = name[-_MAX_EXT_LEN:].lower()
+    # One C-level endswith rejects the (common) non-archive case
+    if not tail.endswith(_EXT_TUPLE):
+        return None
+    if tail.endswith(".tar.gz"):
+        return "tar.gz"
+    return _EXTENSION_TYPES[tail[tail.rindex("."):]]
+
+
+@dataclass(frozen=True, **_SLOTS)
 class ValidationResult:
-    """Result of archive validation."""
+    """Result of archive validation.
+
+    Frozen because results are cached and handed to every caller.
+    """
     is_valid: bool
     archive_type: Optional[str] = None
     error_message: Optional[str] = None
 
 
+# Formats that must start with their signature; ZIP and RAR are left out
+# since self-extracting archives legitimately carry a stub in front
+_GZIP_MAGIC = b"\x1f\x8b"
+_7Z_MAGIC = b"7z\xbc\xaf\x27\x1c"
+
+
+def _has_magic(archive_path: Path, magic: bytes) -> bool:
+    """Check that a file starts with the given signature bytes."""
+    with open(archive_path, "rb") as f:
+        return f.read(len(magic)) == magic
+
+
+_RAR4_MARKER = b"Rar!\x1a\x07\x00"
+_RAR5_MARKER = b"Rar!\x1a\x07\x01\x00"
+
+
+def _read_vint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Decode a RAR5 variable-length integer. Returns (value, next_pos)."""
+    value = shift = 0
+    while pos < len(data):
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            break
+    return value, pos
+
+
+def _rar_headers_encrypted(archive_path: Path) -> bool:
+    """Check the archive header for RAR header encryption (rar -hp).
+
+    RAR4 sets MHD_PASSWORD in the main header flags; RAR5 puts an archive
+    encryption header (type 4) straight after the marker. Per-file
+    encryption without -hp isn't visible here and is left to rarfile.
+    """
+    with open(archive_path, "rb") as f:
+        head = f.read(24)
+
+    if head.startswith(_RAR4_MARKER):
+        # HEAD_CRC(2) HEAD_TYPE(1) HEAD_FLAGS(2) after the 7-byte marker
+        return len(head) >= 12 and head[9] == 0x73 and bool(head[10] & 0x80)
+
+    if head.startswith(_RAR5_MARKER):
+        # CRC32(4), then header size and header type as vints
+        pos = len(_RAR5_MARKER) + 4
+        _size, pos = _read_vint(head, pos)
+        header_type, _pos = _read_vint(head, pos)
+        return header_type == 4
+
+    return False
+
+
+def _invalid_archive_errors() -> Tuple[Type[BaseException], ...]:
+    """Exception types that mean "not a valid archive".
+
+    py7zr is imported lazily (it is slow to import and most runs never see a
+    .7z), so its error type is only included once something has loaded it.
+    """
+    errors = (zipfile.BadZipFile, rarfile.BadRarFile, tarfile.TarError)
+    py7zr = sys.modules.get("py7zr")
+    return errors + (py7zr.Bad7zFile,) if py7zr else errors
+
+
+class _RatioExceeded(Exception):
+    """Raised mid-scan once an archive can no longer pass the ratio check."""
+
+    def __init__(self, ratio: float):
+        super().__init__(ratio)
+        self.ratio = ratio
+
+
+@dataclass(**_SLOTS)
+class ArchiveScan:
+    """Totals and nested archive names gathered in one pass over an archive."""
+    total_size: int = 0
+    compressed_size: int = 0
+    nested: List[str] = field(default_factory=list)
+
+
+_V = TypeVar("_V")
+_CacheKey = Tuple[str, int, int]
+
+
+class _LRUCache(Generic[_V]):
+    """Small thread-safe LRU mapping; the least recently used entry goes first."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[_CacheKey, _V]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: _CacheKey) -> Optional[_V]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: _CacheKey, value: _V) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
 class ArchiveValidator:
     """Validates archives for security and integrity."""
 
-    SUPPORTED_EXTENSIONS = {
-        ".zip": "zip",
-        ".rar": "rar",
-        ".7z": "7z",
-        ".tar": "tar",
-        ".tar.gz": "tar.gz",
-        ".tgz": "tar.gz",
-    }
+    SUPPORTED_EXTENSIONS = _EXTENSION_TYPES
 
     def __init__(self, config: Optional[Config] = None):
         self.config = config or Config()
         self.logger = logging.getLogger(__name__)
+        # Keyed by (path, mtime_ns, size) so a changed file is rescanned
+        self._results: _LRUCache[ValidationResult] = _LRUCache(_CACHE_SIZE)
+        self._scans: _LRUCache[ArchiveScan] = _LRUCache(_CACHE_SIZE)
+
+    def clear_cache(self) -> None:
+        """Forget cached validation results and archive scans."""
+        self._results.clear()
+        self._scans.clear()
+
+    @staticmethod
+    def _cache_key(archive_path: Path) -> _CacheKey:
+        """Build a cache key that changes whenever the file does."""
+        st = archive_path.stat()
+        return (str(archive_path), st.st_mtime_ns, st.st_size)
 
     def validate_archive(self, archive_path: Path) -> ValidationResult:
-        """Validate an archive file."""
-        if not archive_path.exists():
+        """Validate an archive file.
+
+        Results are cached per (path, mtime, size), so validating an unchanged
+        archive again doesn't reopen it. Unexpected errors (such as a
+        PermissionError) may be transient and are not cached.
+        """
+        try:
+            key = self._cache_key(archive_path)
+        except OSError:
             return ValidationResult(False, error_message=f"Archive not found: {archive_path}")
 
+        cached = self._results.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            result = self._validate(archive_path, key)
+        except Exception as e:
+            self.logger.error(f"Validation error for {archive_path}: {e}")
+            return ValidationResult(
+                False, archive_type=self.detect_archive_type(archive_path), error_message=str(e)
+            )
+        self._results.put(key, result)
+        return result
+
+    def validate_archives(self, archive_paths: List[Path]) -> Dict[Path, ValidationResult]:
+        """Validate several archives concurrently.
+
+        Reading archive headers is mostly I/O, so a thread pool overlaps the
+        waits. Results land in the same cache validate_archive uses.
+        """
+        if len(archive_paths) <= 1:
+            return {path: self.validate_archive(path) for path in archive_paths}
+
+        workers = min(32, (os.cpu_count() or 1) * 4, len(archive_paths))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(archive_paths, executor.map(self.validate_archive, archive_paths)))
+
+    def _validate(self, archive_path: Path, key: _CacheKey) -> ValidationResult:
+        """Run the validation checks for an existing archive."""
         archive_type = self.detect_archive_type(archive_path)
         if not archive_type:
             return ValidationResult(False, error_message=f"Unsupported archive type: {archive_path.suffix}")
 
         try:
             # Get file sizes for ratio check
-            total_size, compressed_size = self._get_archive_sizes(archive_path, archive_type)
+            scan = self._scan_archive(archive_path, archive_type, key)
+            total_size, compressed_size = scan.total_size, scan.compressed_size
 
             # Check extraction ratio (zipbomb protection)
             if compressed_size > 0:
@@ -62,61 +261,135 @@ class ArchiveValidator:
 
             return ValidationResult(True, archive_type=archive_type)
 
-        except (zipfile.BadZipFile, rarfile.BadRarFile, tarfile.TarError, py7zr.Bad7zFile) as e:
+        except _RatioExceeded as e:
+            return ValidationResult(
+                False,
+                archive_type=archive_type,
+                error_message=f"Extraction ratio {e.ratio:.1f} exceeds limit {self.config.max_extraction_ratio}"
+            )
+        except _invalid_archive_errors() as e:
             return ValidationResult(False, archive_type=archive_type, error_message=f"Invalid {archive_type} file: {e}")
-        except Exception as e:
-            self.logger.error(f"Validation error for {archive_path}: {e}")
-            return ValidationResult(False, archive_type=archive_type, error_message=str(e))
-
-    def _get_archive_sizes(self, archive_path: Path, archive_type: str) -> Tuple[int, int]:
-        """Get total uncompressed and compressed sizes. Returns (total, compressed)."""
-        total_size = 0
-        compressed_size = 0
-
-        if archive_type == "zip":
-            with zipfile.ZipFile(archive_path, "r") as zf:
-                # Also check integrity
-                if zf.testzip():
-                    raise zipfile.BadZipFile("Corrupted archive")
-                for info in zf.infolist():
-                    total_size += info.file_size
-                    compressed_size += info.compress_size
-
-        elif archive_type == "rar":
-            with rarfile.RarFile(archive_path, "r") as rf:
-                if rf.needs_password():
-                    raise rarfile.BadRarFile("Password protected archive")
-                for info in rf.infolist():
-                    total_size += info.file_size
-                    compressed_size += info.compress_size
-
-        elif archive_type in ("tar", "tar.gz"):
-            mode = "r:gz" if archive_type == "tar.gz" else "r"
-            with tarfile.open(archive_path, mode) as tf:
-                for member in tf.getmembers():
-                    if member.isfile():
-                        total_size += member.size
-            compressed_size = archive_path.stat().st_size
-
-        elif archive_type == "7z":
-            with py7zr.SevenZipFile(archive_path, "r") as szf:
-                if szf.needs_password():
-                    raise py7zr.Bad7zFile("Password protected archive")
-                for info in szf.list():
-                    total_size += info.uncompressed
-                    compressed_size += info.compressed
-                if compressed_size == 0:
-                    compressed_size = archive_path.stat().st_size
-
-        return total_size, compressed_size
+
+    def _scan_archive(
+        self, archive_path: Path, archive_type: str, key: _CacheKey
+    ) -> ArchiveScan:
+        """Read an archive's table of contents once, with caching.
+
+        Member compressed sizes never add up to more than the archive file, so
+        once the running uncompressed total passes max_extraction_ratio times
+        the file size the ratio check is bound to fail. Scanners stop there
+        rather than reading the rest of a zipbomb's member list. RAR is left
+        out since a multi-volume set holds more data than its first file.
+        """
+        scan = self._scans.get(key)
+        if scan is None:
+            archive_size = key[2]
+            if archive_type == "zip":
+                scan = self._scan_zip(archive_path, archive_size)
+            elif archive_type == "rar":
+                scan = self._scan_rar(archive_path)
+            elif archive_type in ("tar", "tar.gz"):
+                scan = self._scan_tar(archive_path, archive_type, archive_size)
+            elif archive_type == "7z":
+                scan = self._scan_7z(archive_path, archive_size)
+            else:
+                scan = ArchiveScan()
+            self._scans.put(key, scan)
+        return scan
+
+    def _scan_zip(self, archive_path: Path, archive_size: int) -> ArchiveScan:
+        """Scan a ZIP archive's central directory.
+
+        A broken central directory raises BadZipFile on open. Member CRCs are
+        only checked here when deep_integrity_check is set, since that means
+        decompressing everything; otherwise zipfile checks them on extract.
+        """
+        scan = ArchiveScan()
+        size_limit = self.config.max_extraction_ratio * archive_size
+        with zipfile.ZipFile(archive_path, "r") as zf:
+            if self.config.deep_integrity_check and zf.testzip():
+                raise zipfile.BadZipFile("Corrupted archive")
+            for info in zf.infolist():
+                scan.total_size += info.file_size
+                if scan.total_size > size_limit:
+                    raise _RatioExceeded(scan.total_size / archive_size)
+                scan.compressed_size += info.compress_size
+                if archive_type_from_name(info.filename):
+                    scan.nested.append(info.filename)
+        return scan
+
+    def _scan_rar(self, archive_path: Path) -> ArchiveScan:
+        """Scan a RAR archive, rejecting password-protected ones."""
+        # Header-encrypted archives can be rejected without parsing them
+        if _rar_headers_encrypted(archive_path):
+            raise rarfile.BadRarFile("Password protected archive")
+
+        scan = ArchiveScan()
+        with rarfile.RarFile(archive_path, "r") as rf:
+            if rf.needs_password():
+                raise rarfile.BadRarFile("Password protected archive")
+            for info in rf.infolist():
+                scan.total_size += info.file_size
+                scan.compressed_size += info.compress_size
+                if archive_type_from_name(info.filename):
+                    scan.nested.append(info.filename)
+        return scan
+
+    def _scan_tar(self, archive_path: Path, archive_type: str, archive_size: int) -> ArchiveScan:
+        """Scan a TAR archive; compressed size is the file size."""
+        scan = ArchiveScan()
+        size_limit = self.config.max_extraction_ratio * archive_size
+        mode = "r:gz" if archive_type == "tar.gz" else "r"
+
+        # Reject non-gzip data before handing it to the decompressor
+        if archive_type == "tar.gz" and not _has_magic(archive_path, _GZIP_MAGIC):
+            raise tarfile.ReadError("not a gzip file")
+
+        # gzip is read front to back, so big reads mean far fewer syscalls;
+        # plain tar seeks past member data, where a big buffer over-reads
+        buffering = GZIP_READ_BUFFER if archive_type == "tar.gz" else -1
+        with open(archive_path, "rb", buffering=buffering) as f, \
+                tarfile.open(fileobj=f, mode=mode) as tf:
+            # Iterate rather than getmembers() so a ratio failure stops
+            # reading (and for .tar.gz, decompressing) partway through
+            for member in tf:
+                if member.isfile():
+                    scan.total_size += member.size
+                    if scan.total_size > size_limit:
+                        raise _RatioExceeded(scan.total_size / archive_size)
+                    if archive_type_from_name(member.name):
+                        scan.nested.append(member.name)
+        scan.compressed_size = archive_size
+        return scan
+
+    def _scan_7z(self, archive_path: Path, archive_size: int) -> ArchiveScan:
+        """Scan a 7z archive, rejecting password-protected ones."""
+        import py7zr
+
+        if not _has_magic(archive_path, _7Z_MAGIC):
+            raise py7zr.Bad7zFile("not a 7z file")
+
+        scan = ArchiveScan()
+        size_limit = self.config.max_extraction_ratio * archive_size
+        with py7zr.SevenZipFile(archive_path, "r") as szf:
+            if szf.needs_password():
+                raise py7zr.Bad7zFile("Password protected archive")
+            # szf.files is the already-parsed header; list() would copy it
+            for entry in szf.files:
+                scan.total_size += entry.uncompressed
+                if scan.total_size > size_limit:
+                    raise _RatioExceeded(scan.total_size / archive_size)
+                # Only the first member of a solid block has a compressed size
+                scan.compressed_size += entry.compressed or 0
+                if archive_type_from_name(entry.filename):
+                    scan.nested.append(entry.filename)
+        if scan.compressed_size == 0:
+            scan.compressed_size = archive_size
+        return scan
 
     def detect_archive_type(self, archive_path: Path) -> Optional[str]:
         """Detect archive type from extension."""
-        name_lower = archive_path.name.lower()
-        if name_lower.endswith(".tar.gz") or name_lower.endswith(".tgz"):
-            return "tar.gz"
-        suffix = archive_path.suffix.lower()
-        return self.SUPPORTED_EXTENSIONS.get(suffix)
+        return archive_type_from_name(archive_path.name)
 
     def is_split_archive_part(self, archive_path: Path) -> Tuple[bool, bool]:
         """Check if this is part of a split archive.
@@ -126,15 +399,14 @@ class ArchiveValidator:
         - (True, True) = split, first part, extract it
         - (True, False) = split, NOT first part, skip it
         """
-        name = archive_path.name.lower()
         suffix = archive_path.suffix.lower()
 
         # .r00, .r01, etc - never first part
-        if re.match(r'^\.r\d+$', suffix):
+        if _SPLIT_RN.match(suffix):
             return (True, False)
 
         # .part2.rar, .part3.rar - not first part
-        match = re.match(r'.*\.part(\d+)\.rar$', name)
+        match = _SPLIT_PART.search(archive_path.name)
         if match:
             return (True, int(match.group(1)) == 1)
 
@@ -145,8 +417,17 @@ class ArchiveValidator:
         return (False, True)
 
     def check_nested_depth(self, archive_path: Path, current_depth: int = 0) -> Tuple[bool, int]:
-        """Check if archive exceeds nested depth limit."""
-        if current_depth >= self.config.max_nested_depth:
+        """Check if archive exceeds nested depth limit.
+
+        current_depth is how many archive levels this one sits below the
+        top-level archive (the extractor passes the extraction pass it was
+        found in); archives deeper than max_nested_depth are rejected. Nested
+        archives are classified by name only and never opened, so the verdict
+        does not depend on how members are compressed.
+
+        Returns (within_limit, deepest_level_seen).
+        """
+        if current_depth > self.config.max_nested_depth:
             return False, current_depth
 
         archive_type = self.detect_archive_type(archive_path)
@@ -154,37 +435,10 @@ class ArchiveValidator:
             return True, current_depth
 
         try:
-            nested_archives = self._get_nested_archive_names(archive_path, archive_type)
-            if nested_archives:
-                depth = current_depth + 1
-                if depth >= self.config.max_nested_depth:
-                    return False, depth
-                return True, depth
+            key = self._cache_key(archive_path)
+            if self._scan_archive(archive_path, archive_type, key).nested:
+                return True, current_depth + 1
         except Exception as e:
             self.logger.warning(f"Error checking nested depth for {archive_path}: {e}")
 
         return True, current_depth
-
-    def _get_nested_archive_names(self, archive_path: Path, archive_type: str) -> List[str]:
-        """Get list of archive files contained within this archive."""
-        nested = []
-
-        if archive_type == "zip":
-            with zipfile.ZipFile(archive_path, "r") as zf:
-                nested = [n for n in zf.namelist() if self.detect_archive_type(Path(n))]
-
-        elif archive_type == "rar":
-            with rarfile.RarFile(archive_path, "r") as rf:
-                nested = [n for n in rf.namelist() if self.detect_archive_type(Path(n))]
-
-        elif archive_type in ("tar", "tar.gz"):
-            mode = "r:gz" if archive_type == "tar.gz" else "r"
-            with tarfile.open(archive_path, mode) as tf:
-                nested = [m.name for m in tf.getmembers()
-                         if m.isfile() and self.detect_archive_type(Path(m.name))]
-
-        elif archive_type == "7z":
-            with py7zr.SevenZipFile(archive_path, "r") as szf:
-                nested = [n for n in szf.getnames() if self.detect_archive_type(Path(n))]
-
-        return nested
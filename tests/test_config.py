@@ -1,10 +1,10 @@
 """Tests for the configuration system."""
 
 import json
+import logging
 import pytest
 import tempfile
 import os
-from pathlib import Path
 
 from qbit_torrent_extract.config import Config, load_config
 
@@ -18,6 +18,7 @@ class TestConfig:
 
         assert config.max_extraction_ratio == 100.0
         assert config.max_nested_depth == 3
+        assert config.deep_integrity_check is False
         assert config.preserve_originals is True
         assert config.log_level == "INFO"
         assert config.progress_indicators is True
@@ -57,6 +58,23 @@ class TestConfig:
         finally:
             os.unlink(temp_file)
 
+    def test_config_from_file_reparses_changed_file(self):
+        """Test that from_file picks up edits to a previously loaded file."""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+            json.dump({"max_nested_depth": 4}, f)
+            temp_file = f.name
+
+        try:
+            assert Config.from_file(temp_file).max_nested_depth == 4
+            assert Config.from_file(temp_file).max_nested_depth == 4
+
+            with open(temp_file, "w") as f:
+                json.dump({"max_nested_depth": 12}, f)
+
+            assert Config.from_file(temp_file).max_nested_depth == 12
+        finally:
+            os.unlink(temp_file)
+
     def test_config_from_file_ignores_unknown_keys(self):
         """Test that unknown keys in config file are ignored."""
         config_data = {
@@ -98,6 +116,36 @@ class TestConfig:
         finally:
             os.unlink(temp_file)
 
+    def test_load_config_invalid_values(self):
+        """Test that bad file values fall back to defaults but bad overrides raise."""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+            json.dump({"max_nested_depth": 0}, f)
+            temp_file = f.name
+
+        try:
+            config = load_config(config_file=temp_file, max_extraction_ratio=50.0)
+            assert config.max_nested_depth == 3
+            assert config.max_extraction_ratio == 50.0
+        finally:
+            os.unlink(temp_file)
+
+        with pytest.raises(ValueError, match="max_nested_depth must be >= 1"):
+            load_config(max_nested_depth=0)
+
+    def test_load_config_invalid_override_does_not_blame_file(self, caplog):
+        """Test that a bad override with a valid file raises without a file warning."""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+            json.dump({"max_nested_depth": 4}, f)
+            temp_file = f.name
+
+        try:
+            with pytest.raises(ValueError, match="max_extraction_ratio must be >= 1"):
+                load_config(config_file=temp_file, max_extraction_ratio=0.5)
+        finally:
+            os.unlink(temp_file)
+
+        assert not [r for r in caplog.records if r.levelno == logging.WARNING]
+
     def test_load_config_ignores_none_overrides(self):
         """Test that None values in overrides are ignored."""
         config = load_config(
@@ -125,5 +173,5 @@ class TestConfig:
         config = Config(log_dir="~/logs")
 
         # Should be expanded to absolute path
-        assert config.log_dir == str(Path("~/logs").expanduser().absolute())
+        assert config.log_dir == os.path.abspath(os.path.expanduser("~/logs"))
 
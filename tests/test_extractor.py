@@ -6,6 +6,8 @@ import tarfile
 import py7zr
 import os
 import gzip
+import io
+from functools import lru_cache
 from pathlib import Path
 from qbit_torrent_extract.extractor import ArchiveExtractor
 from qbit_torrent_extract.config import Config
@@ -18,9 +20,13 @@ def temp_dir():
         yield Path(tmpdirname)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def extractor():
-    """Create an ArchiveExtractor instance."""
+    """Create one ArchiveExtractor shared by the tests in this module.
+
+    extract_all resets its per-run state, so tests using the default
+    config can share an instance; tests needing other settings build their own.
+    """
     from qbit_torrent_extract.logger import setup_logging
 
     config = Config()
@@ -28,13 +34,42 @@ def extractor():
     return ArchiveExtractor(preserve_archives=True, config=config)
 
 
+@lru_cache(maxsize=None)
+def _zip_bytes(content: str) -> bytes:
+    """Build an in-memory ZIP holding test.txt, once per distinct content."""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr("test.txt", content)
+    return buf.getvalue()
+
+
+@lru_cache(maxsize=None)
+def _7z_bytes(content: str) -> bytes:
+    """Build an in-memory 7z holding test.txt, once per distinct content."""
+    buf = io.BytesIO()
+    with py7zr.SevenZipFile(buf, "w") as szf:
+        szf.writestr(content.encode(), "test.txt")
+    return buf.getvalue()
+
+
+@lru_cache(maxsize=None)
+def _tar_gz_bytes(content: str) -> bytes:
+    """Build an in-memory tar.gz holding test.txt, once per distinct content."""
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz", compresslevel=1) as tf:
+        content_bytes = content.encode("utf-8")
+        tarinfo = tarfile.TarInfo(name="test.txt")
+        tarinfo.size = len(content_bytes)
+        tf.addfile(tarinfo, io.BytesIO(content_bytes))
+    return buf.getvalue()
+
+
 def create_test_zip(
     directory: Path, filename: str = "test.zip", content: str = "test content"
 ) -> Path:
     """Create a test ZIP file."""
     zip_path = directory / filename
-    with zipfile.ZipFile(zip_path, "w") as zf:
-        zf.writestr("test.txt", content)
+    zip_path.write_bytes(_zip_bytes(content))
     return zip_path
 
 
@@ -43,8 +78,7 @@ def create_test_7z(
 ) -> Path:
     """Create a test 7z file."""
     sz_path = directory / filename
-    with py7zr.SevenZipFile(sz_path, "w") as szf:
-        szf.writestr(content.encode(), "test.txt")
+    sz_path.write_bytes(_7z_bytes(content))
     return sz_path
 
 
@@ -53,14 +87,7 @@ def create_test_tar_gz(
 ) -> Path:
     """Create a test tar.gz file."""
     tar_path = directory / filename
-    with tarfile.open(tar_path, "w:gz") as tf:
-        # Create a file-like object for the content
-        import io
-
-        content_bytes = content.encode("utf-8")
-        tarinfo = tarfile.TarInfo(name="test.txt")
-        tarinfo.size = len(content_bytes)
-        tf.addfile(tarinfo, io.BytesIO(content_bytes))
+    tar_path.write_bytes(_tar_gz_bytes(content))
     return tar_path
 
 
@@ -111,17 +138,17 @@ def test_get_archive_files(extractor, temp_dir):
     assert any(a.name == "test.zip" for a in archives)
 
 
-def test_extract_zip(extractor, temp_dir):
-    """Test ZIP file extraction."""
-    # Create test ZIP
-    zip_path = create_test_zip(temp_dir)
+def test_get_archive_files_recursive(extractor, temp_dir):
+    """Test that archives in subdirectories and upper-case names are found."""
+    sub_dir = temp_dir / "Season 1"
+    sub_dir.mkdir()
+    create_test_zip(sub_dir, "EPISODE.ZIP")
+    create_test_tgz(temp_dir, "extras.tgz")
+    (sub_dir / "notes.txt").touch()
 
-    # Extract
-    extractor.extract_all(temp_dir)
+    archives = extractor.get_archive_files(str(temp_dir))
 
-    # Check results
-    assert (temp_dir / "test.txt").exists()
-    assert (temp_dir / "test.zip").exists()  # preserved
+    assert archives == sorted([sub_dir / "EPISODE.ZIP", temp_dir / "extras.tgz"])
 
 
 def test_no_preserve_archives(temp_dir):
@@ -159,14 +186,10 @@ def test_empty_directory(extractor, temp_dir):
 def test_nested_archives(extractor, temp_dir):
     """Test handling of nested archives."""
     # Create nested structure: zip containing another zip
-    inner_zip = create_test_zip(temp_dir, "inner.zip", "inner content")
     outer_zip_path = temp_dir / "outer.zip"
 
     with zipfile.ZipFile(outer_zip_path, "w") as zf:
-        zf.write(inner_zip, inner_zip.name)
-
-    # Remove inner zip from temp directory
-    inner_zip.unlink()
+        zf.writestr("inner.zip", _zip_bytes("inner content"))
 
     # Extract
     stats = extractor.extract_all(str(temp_dir))
@@ -178,47 +201,26 @@ def test_nested_archives(extractor, temp_dir):
     assert stats["failed"] == 0
 
 
-def test_extract_7z(extractor, temp_dir):
-    """Test 7z file extraction."""
-    # Create test 7z
-    sz_path = create_test_7z(temp_dir)
+@pytest.mark.parametrize(
+    "create_archive, filename",
+    [
+        (create_test_zip, "test.zip"),
+        (create_test_7z, "test.7z"),
+        (create_test_tar_gz, "test.tar.gz"),
+        (create_test_tgz, "test.tgz"),
+    ],
+    ids=["zip", "7z", "tar.gz", "tgz"],
+)
+def test_extract_archive_types(extractor, temp_dir, create_archive, filename):
+    """Test extraction of each supported archive type."""
+    create_archive(temp_dir, filename)
 
     # Extract
     stats = extractor.extract_all(str(temp_dir))
 
     # Check results
     assert (temp_dir / "test.txt").exists()
-    assert (temp_dir / "test.7z").exists()  # preserved
-    assert stats["successful"] == 1
-    assert stats["failed"] == 0
-
-
-def test_extract_tar_gz(extractor, temp_dir):
-    """Test tar.gz file extraction."""
-    # Create test tar.gz
-    tar_path = create_test_tar_gz(temp_dir)
-
-    # Extract
-    stats = extractor.extract_all(str(temp_dir))
-
-    # Check results
-    assert (temp_dir / "test.txt").exists()
-    assert (temp_dir / "test.tar.gz").exists()  # preserved
-    assert stats["successful"] == 1
-    assert stats["failed"] == 0
-
-
-def test_extract_tgz(extractor, temp_dir):
-    """Test .tgz file extraction."""
-    # Create test .tgz
-    tgz_path = create_test_tgz(temp_dir, "test.tgz")
-
-    # Extract
-    stats = extractor.extract_all(str(temp_dir))
-
-    # Check results
-    assert (temp_dir / "test.txt").exists()
-    assert (temp_dir / "test.tgz").exists()  # preserved
+    assert (temp_dir / filename).exists()  # preserved
     assert stats["successful"] == 1
     assert stats["failed"] == 0
 
@@ -262,6 +264,44 @@ def test_corrupted_archive_handling(temp_dir):
     assert any(word in error_lower for word in ["validation", "invalid", "corrupt", "bad"])
 
 
+def test_corrupted_member_leaves_no_partial_output(temp_dir):
+    """Test that a CRC failure partway through leaves the directory as it was."""
+    (temp_dir / "ep1.mkv").write_bytes(b"existing")
+    zip_path = temp_dir / "release.zip"
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_STORED) as zf:
+        zf.writestr("ep1.mkv", b"A" * 1000)
+        zf.writestr("ep2.mkv", b"B" * 1000)
+    data = zip_path.read_bytes()
+    zip_path.write_bytes(data.replace(b"B" * 1000, b"B" * 999 + b"C"))
+
+    extractor = ArchiveExtractor(preserve_archives=True, config=Config())
+    stats = extractor.extract_all(str(temp_dir))
+
+    assert stats["failed"] == 1
+    assert (temp_dir / "ep1.mkv").read_bytes() == b"existing"
+    assert sorted(p.name for p in temp_dir.iterdir()) == ["ep1.mkv", "release.zip"]
+
+
+def test_corrupted_deflate_stream_leaves_no_partial_output(temp_dir):
+    """Test that a broken deflate stream (zlib.error) also leaves no partial output."""
+    zip_path = temp_dir / "release.zip"
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("ep1.mkv", b"A" * 1000)
+        zf.writestr("ep2.mkv", b"B" * 1000)
+        info = zf.getinfo("ep2.mkv")
+    # Point past ep2.mkv's local header and mark its first block as the
+    # reserved block type, which zlib rejects
+    data = bytearray(zip_path.read_bytes())
+    data[info.header_offset + 30 + len(info.filename) + len(info.extra)] = 0xFF
+    zip_path.write_bytes(bytes(data))
+
+    extractor = ArchiveExtractor(preserve_archives=True, config=Config())
+    stats = extractor.extract_all(str(temp_dir))
+
+    assert stats["failed"] == 1
+    assert sorted(p.name for p in temp_dir.iterdir()) == ["release.zip"]
+
+
 def test_zipbomb_protection(temp_dir):
     """Test zipbomb protection."""
     # Create config with low extraction ratio limit
@@ -287,28 +327,24 @@ def test_nested_depth_limit(temp_dir):
     extractor = ArchiveExtractor(preserve_archives=True, config=config)
 
     # Create deeply nested archives
-    # Level 0: Create innermost zip
-    inner_zip = create_test_zip(temp_dir, "inner.zip", "inner content")
-
-    # Level 1: Create middle zip containing inner zip
-    middle_zip_path = temp_dir / "middle.zip"
-    with zipfile.ZipFile(middle_zip_path, "w") as zf:
-        zf.write(inner_zip, inner_zip.name)
+    # Level 1: Middle zip containing the innermost zip, built in memory
+    middle = io.BytesIO()
+    with zipfile.ZipFile(middle, "w") as zf:
+        zf.writestr("inner.zip", _zip_bytes("inner content"))
 
     # Level 2: Create outer zip containing middle zip
     outer_zip_path = temp_dir / "outer.zip"
     with zipfile.ZipFile(outer_zip_path, "w") as zf:
-        zf.write(middle_zip_path, middle_zip_path.name)
-
-    # Clean up original files
-    inner_zip.unlink()
-    middle_zip_path.unlink()
+        zf.writestr("middle.zip", middle.getvalue())
 
     # Extract - should be limited by depth
     stats = extractor.extract_all(str(temp_dir))
 
-    # Outer should extract, but nested ones should be blocked
-    assert stats["total_processed"] >= 1
+    # Outer (level 0) and middle (level 1) extract; inner (level 2) is refused
+    assert stats["successful"] == 2
+    assert stats["failed"] == 1
+    assert (temp_dir / "inner.zip").exists()
+    assert not (temp_dir / "test.txt").exists()
 
 
 def test_extraction_stats(extractor, temp_dir):
@@ -345,3 +381,22 @@ def test_skip_already_processed_within_run(extractor, temp_dir):
     # Should process outer, then find inner again but skip it as already processed
     assert stats["total_processed"] >= 2
     assert stats["successful"] >= 1
+
+
+def test_split_status_checked_once_per_archive(temp_dir):
+    """Test that each archive's split-part status is only worked out once."""
+    from unittest.mock import patch
+
+    create_test_zip(temp_dir, "one.zip")
+    create_test_zip(temp_dir, "two.zip")
+
+    extractor = ArchiveExtractor(preserve_archives=True, config=Config())
+    with patch.object(
+        extractor.validator,
+        "is_split_archive_part",
+        wraps=extractor.validator.is_split_archive_part,
+    ) as is_split:
+        stats = extractor.extract_all(str(temp_dir))
+
+    assert stats["successful"] == 2
+    assert is_split.call_count == 2
@@ -1,7 +1,7 @@
 """Integration tests for the complete system."""
 
+import io
 import json
-import tempfile
 import zipfile
 from pathlib import Path
 
@@ -12,20 +12,29 @@ from qbit_torrent_extract.extractor import ArchiveExtractor
 from qbit_torrent_extract.logger import setup_logging
 
 
+@pytest.fixture(scope="module")
+def nested_zip_bytes():
+    """Build outer.zip (outerfile.txt + inner.zip holding innerfile.txt) once."""
+    inner = io.BytesIO()
+    with zipfile.ZipFile(inner, "w") as zf:
+        zf.writestr("innerfile.txt", "inner content")
+
+    outer = io.BytesIO()
+    with zipfile.ZipFile(outer, "w") as zf:
+        zf.writestr("inner.zip", inner.getvalue())
+        zf.writestr("outerfile.txt", "outer content")
+    return outer.getvalue()
+
+
 class TestEndToEndIntegration:
     """Test complete end-to-end workflows."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.temp_path = Path(self.temp_dir)
+    @pytest.fixture(autouse=True)
+    def setup_temp_path(self, tmp_path):
+        """Use pytest's tmp_path as the per-test working directory."""
+        self.temp_path = tmp_path
 
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-
-    def test_complete_extraction_workflow(self):
+    def test_complete_extraction_workflow(self, nested_zip_bytes):
         """Test complete extraction workflow with logging."""
         config = Config(
             log_level="DEBUG",
@@ -36,15 +45,7 @@ class TestEndToEndIntegration:
         setup_logging(level=config.log_level, log_dir=config.log_dir)
 
         # Create simple nested structure
-        inner_zip = self.temp_path / "inner.zip"
-        with zipfile.ZipFile(inner_zip, "w") as zf:
-            zf.writestr("innerfile.txt", "inner content")
-
-        outer_zip = self.temp_path / "outer.zip"
-        with zipfile.ZipFile(outer_zip, "w") as zf:
-            zf.write(inner_zip, "inner.zip")
-            zf.writestr("outerfile.txt", "outer content")
-        inner_zip.unlink()
+        (self.temp_path / "outer.zip").write_bytes(nested_zip_bytes)
 
         extractor = ArchiveExtractor(
             preserve_archives=config.preserve_originals,
@@ -136,21 +137,17 @@ class TestEndToEndIntegration:
         assert log_dir.exists()
         main_log = log_dir / "qbit-torrent-extract.log"
         assert main_log.exists()
-        assert "Extracting" in main_log.read_text() or "Starting" in main_log.read_text()
+        log_text = main_log.read_text()
+        assert "Extracting" in log_text or "Starting" in log_text
 
 
 class TestRealWorldScenarios:
     """Test scenarios that mimic real-world usage."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.temp_path = Path(self.temp_dir)
-
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    @pytest.fixture(autouse=True)
+    def setup_temp_path(self, tmp_path):
+        """Use pytest's tmp_path as the per-test working directory."""
+        self.temp_path = tmp_path
 
     def test_qbittorrent_torrent_simulation(self):
         """Simulate qBittorrent torrent structure."""
@@ -203,18 +200,10 @@ class TestRealWorldScenarios:
         assert (self.temp_path / "source.txt").exists()
         assert (self.temp_path / "data.txt").exists()
 
-    def test_progressive_extraction_scenario(self):
+    def test_progressive_extraction_scenario(self, nested_zip_bytes):
         """Test extraction of archives that create more archives."""
-        # Level 1: Inner archive
-        inner = self.temp_path / "inner.zip"
-        with zipfile.ZipFile(inner, "w") as zf:
-            zf.writestr("final.txt", "final content")
-
-        # Level 2: Outer archive containing inner
-        outer = self.temp_path / "outer.zip"
-        with zipfile.ZipFile(outer, "w") as zf:
-            zf.write(inner, "inner.zip")
-        inner.unlink()
+        # Outer archive containing inner.zip
+        (self.temp_path / "outer.zip").write_bytes(nested_zip_bytes)
 
         config = Config(max_nested_depth=5)
         extractor = ArchiveExtractor(config=config)
@@ -222,48 +211,33 @@ class TestRealWorldScenarios:
         stats = extractor.extract_all(str(self.temp_path))
 
         assert stats["successful"] == 2
-        assert (self.temp_path / "final.txt").exists()
+        assert (self.temp_path / "innerfile.txt").exists()
 
 
 class TestSystemIntegration:
     """System-level integration tests."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.temp_path = Path(self.temp_dir)
+    @pytest.fixture(autouse=True)
+    def setup_temp_path(self, tmp_path):
+        """Use pytest's tmp_path as the per-test working directory."""
+        self.temp_path = tmp_path
 
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-
-    def test_disk_space_handling(self):
-        """Test handling when disk space is available."""
+    @pytest.mark.parametrize("count", [1, 3])
+    def test_extract_several_archives(self, count):
+        """Test that each archive in a directory is extracted exactly once."""
         config = Config()
         extractor = ArchiveExtractor(config=config)
 
-        # Create small archive
-        zip_path = self.temp_path / "small.zip"
-        with zipfile.ZipFile(zip_path, "w") as zf:
-            zf.writestr("small.txt", "small content")
-
-        stats = extractor.extract_all(str(self.temp_path))
-        assert stats["successful"] == 1
-
-    def test_concurrent_access_simulation(self):
-        """Test extraction doesn't interfere with itself."""
-        config = Config()
-        extractor = ArchiveExtractor(config=config)
-
-        # Create multiple archives
-        for i in range(3):
+        for i in range(count):
             zip_path = self.temp_path / f"archive_{i}.zip"
             with zipfile.ZipFile(zip_path, "w") as zf:
                 zf.writestr(f"file_{i}.txt", f"content {i}")
 
         stats = extractor.extract_all(str(self.temp_path))
-        assert stats["successful"] == 3
+        assert stats["successful"] == count
+        assert stats["total_processed"] == count
+        for i in range(count):
+            assert (self.temp_path / f"file_{i}.txt").read_text() == f"content {i}"
 
     def test_different_compression_methods(self):
         """Test extraction with different compression methods."""
@@ -45,6 +45,18 @@ class TestLogging:
             logger.info("Test")
             assert log_dir.exists()
 
+    def test_setup_logging_closes_previous_handlers(self):
+        """Test that reconfiguring logging closes the old file handler."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            logger = setup_logging(log_dir=tmpdir)
+            file_handler = logger.handlers[-1]
+
+            logger = setup_logging(log_dir=tmpdir)
+
+            assert file_handler not in logger.handlers
+            assert file_handler.stream is None
+            assert len(logger.handlers) == 2
+
     def test_get_logger(self):
         """Test getting a logger instance."""
         setup_logging()
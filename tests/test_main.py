@@ -1,7 +1,7 @@
 """Tests for the main CLI module."""
 
+import io
 import json
-import tempfile
 import zipfile
 from pathlib import Path
 from unittest.mock import patch
@@ -15,17 +15,11 @@ from qbit_torrent_extract.main import main
 class TestCLI:
     """Test the command-line interface."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self, tmp_path):
+        """Set up test fixtures in pytest's tmp_path."""
         self.runner = CliRunner()
-        self.temp_dir = tempfile.mkdtemp()
-        self.temp_path = Path(self.temp_dir)
-
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        import shutil
-
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self.temp_path = tmp_path
 
     def create_test_zip(self, filename: str, content: str = "test content") -> Path:
         """Create a test ZIP file."""
@@ -73,22 +67,15 @@ class TestCLI:
         assert "Found" in result.output
         assert "test.zip" in result.output
 
-    def test_preserve_option(self):
+    @pytest.mark.parametrize("flag, kept", [("--preserve", True), ("--no-preserve", False)])
+    def test_preserve_option(self, flag, kept):
         """Test archive preservation options."""
         zip_path = self.create_test_zip("test.zip")
 
-        # Test with --preserve (default)
-        result = self.runner.invoke(main, [str(self.temp_path), "--preserve"])
-        assert result.exit_code == 0
-        assert zip_path.exists()  # Archive should still exist
-
-        # Clean up extracted file for next test
-        (self.temp_path / "test.txt").unlink()
-
-        # Test with --no-preserve
-        result = self.runner.invoke(main, [str(self.temp_path), "--no-preserve"])
+        result = self.runner.invoke(main, [str(self.temp_path), flag])
         assert result.exit_code == 0
-        assert not zip_path.exists()  # Archive should be deleted
+        assert (self.temp_path / "test.txt").exists()
+        assert zip_path.exists() is kept
 
     def test_config_file_option(self):
         """Test configuration file option."""
@@ -124,6 +111,12 @@ class TestCLI:
         result = self.runner.invoke(main, [str(self.temp_path), "--max-depth", "5"])
         assert result.exit_code == 0
 
+    def test_invalid_max_depth_option(self):
+        """Test that an out-of-range override is reported as a usage error."""
+        result = self.runner.invoke(main, [str(self.temp_path), "--max-depth", "0"])
+        assert result.exit_code == 2
+        assert "max_nested_depth must be >= 1" in result.output
+
     def test_log_dir_option(self):
         """Test log directory option."""
         log_dir = self.temp_path / "logs"
@@ -161,32 +154,23 @@ class TestCLI:
 class TestCLIIntegration:
     """Integration tests for the CLI with various scenarios."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self, tmp_path):
+        """Set up test fixtures in pytest's tmp_path."""
         self.runner = CliRunner()
-        self.temp_dir = tempfile.mkdtemp()
-        self.temp_path = Path(self.temp_dir)
-
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        import shutil
-
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self.temp_path = tmp_path
 
     def create_nested_archives(self):
         """Create nested archive structure for testing."""
-        # Create inner ZIP
-        inner_zip = self.temp_path / "inner.zip"
+        # Create inner ZIP in memory
+        inner_zip = io.BytesIO()
         with zipfile.ZipFile(inner_zip, "w") as zf:
             zf.writestr("inner_file.txt", "inner content")
 
         # Create outer ZIP containing inner ZIP
         outer_zip = self.temp_path / "outer.zip"
         with zipfile.ZipFile(outer_zip, "w") as zf:
-            zf.write(inner_zip, "inner.zip")
-
-        # Clean up the standalone inner ZIP
-        inner_zip.unlink()
+            zf.writestr("inner.zip", inner_zip.getvalue())
 
         return outer_zip
 
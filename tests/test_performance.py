@@ -1,9 +1,8 @@
 """Performance tests for archive extraction."""
 
+import io
 import time
-import tempfile
 import zipfile
-from pathlib import Path
 
 import pytest
 
@@ -14,18 +13,13 @@ from qbit_torrent_extract.extractor import ArchiveExtractor
 class TestExtractionPerformance:
     """Test extraction performance characteristics."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.temp_path = Path(self.temp_dir)
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self, tmp_path):
+        """Set up test fixtures in pytest's tmp_path."""
+        self.temp_path = tmp_path
         self.config = Config()
         self.extractor = ArchiveExtractor(config=self.config)
 
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-
     @pytest.mark.performance
     def test_small_files_performance(self):
         """Test performance with many small files."""
@@ -34,9 +28,9 @@ class TestExtractionPerformance:
             for i in range(100):
                 zf.writestr(f"file_{i}.txt", f"content {i}")
 
-        start = time.time()
+        start = time.perf_counter()
         stats = self.extractor.extract_all(str(self.temp_path))
-        elapsed = time.time() - start
+        elapsed = time.perf_counter() - start
 
         assert elapsed < 5.0
         assert stats["successful"] == 1
@@ -44,8 +38,8 @@ class TestExtractionPerformance:
     @pytest.mark.performance
     def test_nested_archives_performance(self):
         """Test performance with nested archives."""
-        # Create inner archive
-        inner = self.temp_path / "inner.zip"
+        # Create inner archive in memory
+        inner = io.BytesIO()
         with zipfile.ZipFile(inner, "w") as zf:
             for i in range(10):
                 zf.writestr(f"inner_{i}.txt", f"content {i}")
@@ -53,12 +47,11 @@ class TestExtractionPerformance:
         # Create outer archive
         outer = self.temp_path / "outer.zip"
         with zipfile.ZipFile(outer, "w") as zf:
-            zf.write(inner, "inner.zip")
-        inner.unlink()
+            zf.writestr("inner.zip", inner.getvalue())
 
-        start = time.time()
+        start = time.perf_counter()
         stats = self.extractor.extract_all(str(self.temp_path))
-        elapsed = time.time() - start
+        elapsed = time.perf_counter() - start
 
         assert elapsed < 5.0
         assert stats["successful"] == 2
@@ -67,15 +60,10 @@ class TestExtractionPerformance:
 class TestValidationPerformance:
     """Test validation performance."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.temp_path = Path(self.temp_dir)
-
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self, tmp_path):
+        """Set up test fixtures in pytest's tmp_path."""
+        self.temp_path = tmp_path
 
     @pytest.mark.performance
     def test_validation_speed(self):
@@ -89,10 +77,12 @@ class TestValidationPerformance:
         config = Config()
         validator = ArchiveValidator(config)
 
-        start = time.time()
+        start = time.perf_counter()
         for _ in range(100):
+            # Results are cached per file; clear so each pass really validates
+            validator.clear_cache()
             validator.validate_archive(zip_path)
-        elapsed = time.time() - start
+        elapsed = time.perf_counter() - start
 
         # 100 validations should take less than 2 seconds
         assert elapsed < 2.0
@@ -101,15 +91,10 @@ class TestValidationPerformance:
 class TestBenchmarks:
     """Simple benchmarks for regression testing."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.temp_path = Path(self.temp_dir)
-
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self, tmp_path):
+        """Set up test fixtures in pytest's tmp_path."""
+        self.temp_path = tmp_path
 
     @pytest.mark.performance
     def test_baseline_performance_benchmark(self):
@@ -123,9 +108,9 @@ class TestBenchmarks:
             with zipfile.ZipFile(zip_path, "w") as zf:
                 zf.writestr("test.txt", "content")
 
-        start = time.time()
+        start = time.perf_counter()
         stats = extractor.extract_all(str(self.temp_path))
-        elapsed = time.time() - start
+        elapsed = time.perf_counter() - start
 
         assert elapsed < 3.0
         assert stats["successful"] == 5
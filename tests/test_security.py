@@ -1,6 +1,6 @@
 """Security-focused tests for archive extraction."""
 
-import tempfile
+import io
 import zipfile
 from pathlib import Path
 
@@ -14,19 +14,14 @@ from qbit_torrent_extract.validator import ArchiveValidator
 class TestZipbombProtection:
     """Test protection against zipbomb attacks."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.temp_path = Path(self.temp_dir)
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self, tmp_path):
+        """Set up test fixtures in pytest's tmp_path."""
+        self.temp_path = tmp_path
         self.config = Config(max_extraction_ratio=10.0)  # Low ratio for testing
         self.extractor = ArchiveExtractor(config=self.config)
         self.validator = ArchiveValidator(self.config)
 
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-
     def create_zipbomb(self, compression_ratio: float = 100.0) -> Path:
         """Create a zipbomb-like archive for testing."""
         zip_path = self.temp_path / "zipbomb.zip"
@@ -86,36 +81,27 @@ class TestZipbombProtection:
 class TestNestedDepthProtection:
     """Test protection against excessive nesting depth."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.temp_path = Path(self.temp_dir)
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self, tmp_path):
+        """Set up test fixtures in pytest's tmp_path."""
+        self.temp_path = tmp_path
         self.config = Config(max_nested_depth=2)
         self.extractor = ArchiveExtractor(config=self.config)
         self.validator = ArchiveValidator(self.config)
 
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-
-    def create_nested_zip(self, depth: int) -> Path:
+    def create_nested_zip(self, depth: int, compression: int = zipfile.ZIP_STORED) -> Path:
         """Create nested ZIP archives."""
-        # Create innermost content
-        inner_content = self.temp_path / "content.txt"
-        inner_content.write_text("innermost")
-
-        current = inner_content
+        # Build each level in memory around the previous one
+        name, data = "content.txt", b"innermost"
         for i in range(depth):
-            zip_path = self.temp_path / f"level{i}.zip"
-            with zipfile.ZipFile(zip_path, "w") as zf:
-                zf.write(current, current.name)
-            if current != inner_content:
-                current.unlink()
-            current = zip_path
+            buf = io.BytesIO()
+            with zipfile.ZipFile(buf, "w", compression=compression) as zf:
+                zf.writestr(name, data)
+            name, data = f"level{i}.zip", buf.getvalue()
 
-        inner_content.unlink()
-        return current
+        zip_path = self.temp_path / name
+        zip_path.write_bytes(data)
+        return zip_path
 
     def test_nested_depth_check(self):
         """Test nested depth checking on a single archive."""
@@ -126,16 +112,32 @@ class TestNestedDepthProtection:
         assert within_limit
         assert depth >= 1
 
-    def test_nested_depth_limit_enforcement(self):
+    def test_nested_depth_rejects_archives_below_limit(self):
+        """Test that an archive nested deeper than the limit is rejected."""
+        nested_zip = self.create_nested_zip(2)
+
+        within_limit, depth = self.validator.check_nested_depth(nested_zip, 2)
+        assert within_limit
+        assert depth == 3
+
+        within_limit, depth = self.validator.check_nested_depth(nested_zip, 3)
+        assert not within_limit
+        assert depth == 3
+
+    @pytest.mark.parametrize("compression", [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED])
+    def test_nested_depth_limit_enforcement(self, compression):
         """Test that nested depth limit is enforced during extraction."""
-        # Create deeply nested structure
-        nested_zip = self.create_nested_zip(5)
+        # level4.zip > level3.zip > level2.zip > level1.zip > level0.zip > content.txt
+        self.create_nested_zip(5, compression)
 
-        # Extract with max_nested_depth=2
+        # With max_nested_depth=2, levels 0-2 extract and level1.zip (level 3) is refused
         stats = self.extractor.extract_all(str(self.temp_path))
 
-        # Should process some but hit depth limit
-        assert stats["total_processed"] >= 1
+        assert stats["successful"] == 3
+        assert stats["failed"] == 1
+        assert "nested depth" in stats["errors"][0]
+        assert (self.temp_path / "level1.zip").exists()
+        assert not (self.temp_path / "level0.zip").exists()
 
     def test_nesting_depth_configuration(self):
         """Test that nesting depth limit can be configured."""
@@ -151,18 +153,13 @@ class TestNestedDepthProtection:
 class TestPathTraversalProtection:
     """Test protection against path traversal attacks."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.temp_path = Path(self.temp_dir)
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self, tmp_path):
+        """Set up test fixtures in pytest's tmp_path."""
+        self.temp_path = tmp_path
         self.config = Config()
         self.extractor = ArchiveExtractor(config=self.config)
 
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-
     def test_path_traversal_prevention(self):
         """Test that path traversal attempts are blocked."""
         zip_path = self.temp_path / "malicious.zip"
@@ -184,19 +181,14 @@ class TestPathTraversalProtection:
 class TestCorruptedArchiveHandling:
     """Test handling of corrupted archives."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.temp_path = Path(self.temp_dir)
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self, tmp_path):
+        """Set up test fixtures in pytest's tmp_path."""
+        self.temp_path = tmp_path
         self.config = Config()
         self.extractor = ArchiveExtractor(config=self.config)
         self.validator = ArchiveValidator(self.config)
 
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-
     def test_corrupted_zip_detection(self):
         """Test detection of corrupted ZIP files."""
         zip_path = self.temp_path / "corrupted.zip"
@@ -239,18 +231,13 @@ class TestCorruptedArchiveHandling:
 class TestResourceExhaustionProtection:
     """Test protection against resource exhaustion."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.temp_path = Path(self.temp_dir)
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self, tmp_path):
+        """Set up test fixtures in pytest's tmp_path."""
+        self.temp_path = tmp_path
         self.config = Config()
         self.extractor = ArchiveExtractor(config=self.config)
 
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-
     def test_large_number_of_files(self):
         """Test handling of archives with many files."""
         zip_path = self.temp_path / "many_files.zip"
@@ -275,15 +262,10 @@ class TestResourceExhaustionProtection:
 class TestSecurityIntegration:
     """Integration tests for security features."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.temp_path = Path(self.temp_dir)
-
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    @pytest.fixture(autouse=True)
+    def setup_fixtures(self, tmp_path):
+        """Set up test fixtures in pytest's tmp_path."""
+        self.temp_path = tmp_path
 
     def test_mixed_safe_and_dangerous_archives(self):
         """Test processing mix of safe and dangerous archives."""
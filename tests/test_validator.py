@@ -41,6 +41,9 @@ class TestArchiveValidator:
         assert validator.detect_archive_type(Path("test.tar.gz")) == "tar.gz"
         assert validator.detect_archive_type(Path("test.tgz")) == "tar.gz"
         assert validator.detect_archive_type(Path("test.txt")) is None
+        assert validator.detect_archive_type(Path("TEST.ZIP")) == "zip"
+        assert validator.detect_archive_type(Path("Show.S01.TAR.GZ")) == "tar.gz"
+        assert validator.detect_archive_type(Path("test.zip.txt")) is None
 
     def test_validate_nonexistent_file(self, validator, temp_dir):
         """Test validation of nonexistent file."""
@@ -77,6 +80,20 @@ class TestArchiveValidator:
         assert not result.is_valid
         assert "invalid" in result.error_message.lower()
 
+    def test_deep_integrity_check(self, validator, temp_dir):
+        """Test that member CRCs are only checked when asked for."""
+        zip_path = self.create_test_zip(temp_dir / "badcrc.zip", {"test.txt": "test content"})
+        data = zip_path.read_bytes()
+        zip_path.write_bytes(data.replace(b"test content", b"TEST CONTENT"))
+
+        # Central directory is intact, so the cheap check passes
+        assert validator.validate_archive(zip_path).is_valid
+
+        deep_validator = ArchiveValidator(Config(deep_integrity_check=True))
+        result = deep_validator.validate_archive(zip_path)
+        assert not result.is_valid
+        assert "invalid" in result.error_message.lower()
+
     def test_validate_zipbomb(self, validator, temp_dir):
         """Test detection of zipbomb-like archives."""
         # Create archive with highly compressible data
@@ -110,6 +127,21 @@ class TestArchiveValidator:
         # Empty file will fail validation
         assert not result.is_valid
 
+    def test_validate_header_encrypted_rar(self, validator, temp_dir):
+        """Test that header-encrypted RARs are rejected from the marker alone."""
+        # RAR4: marker, then main header with MHD_PASSWORD set
+        rar4 = temp_dir / "protected4.rar"
+        rar4.write_bytes(b"Rar!\x1a\x07\x00" + b"\x00\x00\x73\x80\x00\x0d\x00" + b"\x00" * 16)
+
+        # RAR5: marker, then an archive encryption header (type 4)
+        rar5 = temp_dir / "protected5.rar"
+        rar5.write_bytes(b"Rar!\x1a\x07\x01\x00" + b"\x00" * 4 + b"\x21\x04" + b"\x00" * 16)
+
+        for rar_path in (rar4, rar5):
+            result = validator.validate_archive(rar_path)
+            assert not result.is_valid
+            assert "password" in result.error_message.lower()
+
     def test_validate_valid_tar(self, validator, temp_dir):
         """Test validation of valid TAR file."""
         import io
@@ -130,7 +162,7 @@ class TestArchiveValidator:
         import io
 
         tar_path = temp_dir / "test.tar.gz"
-        with tarfile.open(tar_path, "w:gz") as tf:
+        with tarfile.open(tar_path, "w:gz", compresslevel=1) as tf:
             data = b"test content"
             tarinfo = tarfile.TarInfo(name="test.txt")
             tarinfo.size = len(data)
@@ -140,6 +172,68 @@ class TestArchiveValidator:
         assert result.is_valid
         assert result.archive_type == "tar.gz"
 
+    def test_validate_solid_7z(self, validator, temp_dir):
+        """Test validation of a 7z with several members in one solid block."""
+        import py7zr
+
+        path_7z = temp_dir / "solid.7z"
+        with py7zr.SevenZipFile(path_7z, "w") as szf:
+            szf.writestr(b"first file", "first.txt")
+            szf.writestr(b"second file", "second.txt")
+            szf.writestr(b"fake zip", "inner.zip")
+
+        result = validator.validate_archive(path_7z)
+        assert result.is_valid
+        assert result.archive_type == "7z"
+
+        within_limit, depth = validator.check_nested_depth(path_7z, 0)
+        assert within_limit
+        assert depth == 1
+
+    def test_validate_wrong_signature(self, validator, temp_dir):
+        """Test that non-gzip/non-7z data is rejected as invalid, not as a bomb."""
+        fake_tar_gz = temp_dir / "fake.tar.gz"
+        fake_tar_gz.write_bytes(b"this is not a gzip file at all\xff\xff\xff\x7f")
+        result = validator.validate_archive(fake_tar_gz)
+        assert not result.is_valid
+        assert result.error_message.startswith("Invalid tar.gz file")
+
+        fake_7z = temp_dir / "fake.7z"
+        fake_7z.write_bytes(b"this is not a 7z file")
+        result = validator.validate_archive(fake_7z)
+        assert not result.is_valid
+        assert result.error_message.startswith("Invalid 7z file")
+
+    def test_validate_tar_gz_bomb(self, validator, temp_dir):
+        """Test that a highly compressible tar.gz fails the ratio check."""
+        import io
+
+        tar_path = temp_dir / "bomb.tar.gz"
+        with tarfile.open(tar_path, "w:gz", compresslevel=1) as tf:
+            data = b"\0" * (1024 * 1024)
+            tarinfo = tarfile.TarInfo(name="zeros.bin")
+            tarinfo.size = len(data)
+            tf.addfile(tarinfo, io.BytesIO(data))
+
+        result = validator.validate_archive(tar_path)
+        assert not result.is_valid
+        assert "ratio" in result.error_message.lower()
+
+    def test_validate_tar_gz_many_small_files(self, validator, temp_dir):
+        """Test that tar header overhead does not count towards the ratio."""
+        import io
+
+        tar_path = temp_dir / "small.tar.gz"
+        with tarfile.open(tar_path, "w:gz") as tf:
+            for i in range(5000):
+                data = b"0123456789"
+                tarinfo = tarfile.TarInfo(name=f"file{i}.txt")
+                tarinfo.size = len(data)
+                tf.addfile(tarinfo, io.BytesIO(data))
+
+        result = validator.validate_archive(tar_path)
+        assert result.is_valid
+
     def test_validate_7z_not_implemented(self, validator, temp_dir):
         """Test validation of 7z files."""
         path_7z = temp_dir / "test.7z"
@@ -205,3 +299,67 @@ class TestArchiveValidator:
         is_split, is_first = validator.is_split_archive_part(zip_path)
         assert not is_split
         assert is_first
+
+    def test_validation_cache(self, validator, temp_dir):
+        """Test that results are cached until the archive changes."""
+        zip_path = self.create_test_zip(temp_dir / "cached.zip", {"test.txt": "content"})
+
+        first = validator.validate_archive(zip_path)
+        assert validator.validate_archive(zip_path) is first
+
+        # Rewriting the file changes its size, so it must be rescanned
+        zip_path.write_bytes(b"no longer a zip file")
+        result = validator.validate_archive(zip_path)
+        assert result is not first
+        assert not result.is_valid
+
+        validator.clear_cache()
+        assert validator.validate_archive(zip_path) is not result
+
+    def test_validation_cache_is_bounded(self, validator, temp_dir, monkeypatch):
+        """Test that the least recently used results are evicted."""
+        monkeypatch.setattr(validator._results, "maxsize", 2)
+        paths = [
+            self.create_test_zip(temp_dir / f"archive_{i}.zip", {"test.txt": f"content {i}"})
+            for i in range(3)
+        ]
+
+        first = validator.validate_archive(paths[0])
+        for path in paths[1:]:
+            validator.validate_archive(path)
+
+        assert len(validator._results) == 2
+        assert validator.validate_archive(paths[0]) is not first
+
+    def test_unexpected_errors_are_not_cached(self, validator, temp_dir, monkeypatch):
+        """Test that a transient error is retried on the next validation."""
+        zip_path = self.create_test_zip(temp_dir / "flaky.zip", {"test.txt": "content"})
+
+        def denied(*args):
+            raise PermissionError("permission denied")
+
+        with monkeypatch.context() as m:
+            m.setattr(validator, "_scan_zip", denied)
+            result = validator.validate_archive(zip_path)
+        assert not result.is_valid
+        assert "permission denied" in result.error_message
+
+        assert validator.validate_archive(zip_path).is_valid
+
+    def test_validate_archives(self, validator, temp_dir):
+        """Test batch validation of several archives."""
+        paths = [
+            self.create_test_zip(temp_dir / f"archive_{i}.zip", {"test.txt": f"content {i}"})
+            for i in range(4)
+        ]
+        corrupted = temp_dir / "corrupted.zip"
+        corrupted.write_bytes(b"this is not a zip file")
+        paths.append(corrupted)
+
+        results = validator.validate_archives(paths)
+
+        assert list(results) == paths
+        assert all(results[p].is_valid for p in paths[:4])
+        assert not results[corrupted].is_valid
+        # Results are shared with validate_archive's cache
+        assert validator.validate_archive(paths[0]) is results[paths[0]]